@@ -0,0 +1,12 @@
+"""
+ASGI entry point
+
+Wraps the WSGI Flask app so it can run under an ASGI server and
+overlap database waits across concurrent requests:
+
+    uvicorn asgi:asgi_app --workers 4
+"""
+from asgiref.wsgi import WsgiToAsgi
+from service import app
+
+asgi_app = WsgiToAsgi(app)
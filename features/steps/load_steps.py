@@ -30,6 +30,10 @@ HTTP_200_OK = 200
 HTTP_201_CREATED = 201
 HTTP_204_NO_CONTENT = 204
 
+# One session for all REST calls so TCP connections are kept alive
+# instead of being re-established per request
+session = requests.Session()
+
 @given('the following products')
 def step_impl(context):
     """ Delete all Products and load new ones """
@@ -37,10 +41,10 @@ def step_impl(context):
     # List all of the products and delete them one by one
     #
     rest_endpoint = f"{context.base_url}/products"
-    context.resp = requests.get(rest_endpoint)
+    context.resp = session.get(rest_endpoint)
     assert(context.resp.status_code == HTTP_200_OK)
     for product in context.resp.json():
-        context.resp = requests.delete(f"{rest_endpoint}/{product['id']}")
+        context.resp = session.delete(f"{rest_endpoint}/{product['id']}")
         assert(context.resp.status_code == HTTP_204_NO_CONTENT)
 
     #
@@ -56,6 +60,6 @@ def step_impl(context):
             "category": row['category']
         }    
         # send a POST request to the REST endpoint.
-        context.resp = requests.post(rest_endpoint, json=payload)
+        context.resp = session.post(rest_endpoint, json=payload)
         # assert that the HTTP status code of the response is equal to 201.
         assert context.resp.status_code == HTTP_201_CREATED
\ No newline at end of file
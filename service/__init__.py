@@ -23,8 +23,10 @@ and SQL database
 """
 import sys
 from flask import Flask
+from flask_compress import Compress
 from service import config
 from service.common import log_handlers
+from service.common.json_provider import OrjsonProvider
 
 # NOTE: Do not change the order of this code
 # The Flask app must be created
@@ -36,6 +38,12 @@ app = Flask(__name__)  # pylint: disable=invalid-name
 # Load Configurations
 app.config.from_object(config)
 
+# Serialize JSON responses with orjson
+app.json = OrjsonProvider(app)
+
+# Compress large JSON responses (see COMPRESS_* settings in config)
+Compress(app)
+
 # Dependencies require we import the routes AFTER the Flask app is created
 # pylint: disable=wrong-import-position, wrong-import-order, cyclic-import
 from service import routes, models        # noqa: F401, E402
@@ -43,6 +51,7 @@ from service.common import error_handlers, cli_commands  # noqa: F401, E402
 
 # Set up logging for production
 log_handlers.init_logging(app, "gunicorn.error")
+app.logger.setLevel(app.config["LOGGING_LEVEL"])
 
 app.logger.info(70 * "*")
 app.logger.info("  P E T   S E R V I C E   R U N N I N G  ".center(70, "*"))
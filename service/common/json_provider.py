@@ -0,0 +1,62 @@
+######################################################################
+# Copyright 2016, 2023 John J. Rofrano. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+######################################################################
+
+"""
+JSON Provider
+
+This module contains a Flask JSON provider backed by orjson so that
+serializing responses does not go through the stdlib json encoder
+"""
+from enum import Enum
+from decimal import Decimal
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# orjson options used for every dump
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def default(obj):
+    """Fallback serializer for types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.name
+    return DefaultJSONProvider.default(obj)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson
+
+    Decimal values (price) are written as strings and Enum values
+    (category) as their names so that deserialize() round-trips losslessly
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serializes an object to a JSON string"""
+        return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """Deserializes an object from JSON"""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Builds a JSON response directly from orjson bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=default, option=ORJSON_OPTIONS),
+            mimetype="application/json",
+        )
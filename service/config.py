@@ -13,8 +13,29 @@ DATABASE_URI = os.getenv(
 # Configure SQLAlchemy
 SQLALCHEMY_DATABASE_URI = DATABASE_URI
 SQLALCHEMY_TRACK_MODIFICATIONS = False
-# SQLALCHEMY_POOL_SIZE = 2
+
+# Connection pooling amortizes the TCP + auth handshake across requests
+# and pre-ping keeps stale sockets from causing reconnect storms.
+# SQLite uses pools that do not accept these arguments so only apply
+# them to PostgreSQL
+if DATABASE_URI.startswith("postgres"):
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+# Compress large JSON responses on the wire
+COMPRESS_MIMETYPES = ["application/json"]
+COMPRESS_ALGORITHM = ["br", "gzip"]
+COMPRESS_MIN_SIZE = 1024
 
 # Secret for session management
 SECRET_KEY = os.getenv("SECRET_KEY", "sup3r-s3cr3t")
-LOGGING_LEVEL = logging.INFO
+
+# Default to WARNING so per-request info logging stays off the hot
+# path in production; override with LOGGING_LEVEL=INFO when needed
+LOGGING_LEVEL = getattr(
+    logging, os.getenv("LOGGING_LEVEL", "WARNING").upper(), logging.WARNING
+)
@@ -33,6 +33,7 @@ from enum import Enum
 from decimal import Decimal
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import delete, update
 
 logger = logging.getLogger("flask.app")
 
@@ -68,6 +69,9 @@ class Product(db.Model):
     from us by SQLAlchemy's object relational mappings (ORM)
     """
 
+    # Columns returned by list_rows() in serialization order
+    LIST_COLUMNS = ("id", "name", "description", "price", "available", "category")
+
     ##################################################
     # Table Schema
     ##################################################
@@ -80,6 +84,16 @@ class Product(db.Model):
         db.Enum(Category), nullable=False, server_default=(Category.UNKNOWN.name)
     )
 
+    # The list endpoint filters on these columns exclusively so give
+    # each one a B-tree index, plus a composite for combined filters
+    __table_args__ = (
+        db.Index("ix_product_name", "name"),
+        db.Index("ix_product_category", "category"),
+        db.Index("ix_product_available", "available"),
+        db.Index("ix_product_price", "price"),
+        db.Index("ix_product_category_available", "category", "available"),
+    )
+
     ##################################################
     # INSTANCE METHODS
     ##################################################
@@ -90,27 +104,33 @@ class Product(db.Model):
     def create(self):
         """
         Creates a Product to the database
+
+        The row is flushed, not committed; the request-level hook in
+        routes commits once per request
         """
         logger.info("Creating %s", self.name)
         # id must be none to generate next primary key
         self.id = None  # pylint: disable=invalid-name
         db.session.add(self)
-        db.session.commit()
+        db.session.flush()
 
     def update(self):
         """
         Updates a Product to the database
+
+        The row is flushed, not committed; the request-level hook in
+        routes commits once per request
         """
         logger.info("Saving %s", self.name)
         if not self.id:
             raise DataValidationError("Update called with empty ID field")
-        db.session.commit()
+        db.session.flush()
 
     def delete(self):
         """Removes a Product from the data store"""
         logger.info("Deleting %s", self.name)
         db.session.delete(self)
-        db.session.commit()
+        db.session.flush()
 
     def serialize(self) -> dict:
         """Serializes a Product into a dictionary"""
@@ -164,17 +184,98 @@ class Product(db.Model):
 
         """
         logger.info("Initializing database")
-        # This is where we initialize SQLAlchemy from the Flask app
-        db.init_app(app)
+        # This is where we initialize SQLAlchemy from the Flask app;
+        # init_app() may only run once per app, so skip it when another
+        # suite (or a prior call) has already registered the extension
+        if "sqlalchemy" not in app.extensions:
+            db.init_app(app)
         app.app_context().push()
         db.create_all()  # make our sqlalchemy tables
 
+    @classmethod
+    def update_by_id(cls, product_id: int, fields: dict):
+        """Updates a Product with a single UPDATE ... RETURNING statement
+
+        Avoids the SELECT round-trip of loading the Product first; the
+        updated row comes back from the same statement
+
+        :param product_id: the id of the Product to update
+        :type product_id: int
+        :param fields: the column values to set
+        :type fields: dict
+
+        :return: the updated row as a column tuple, or None if not found
+        :rtype: Row
+
+        """
+        logger.info("Updating product id %s ...", product_id)
+        stmt = (
+            update(cls.__table__)
+            .where(cls.id == product_id)
+            .values(**fields)
+            .returning(*cls.__table__.c)
+        )
+        return db.session.execute(stmt).one_or_none()
+
+    @classmethod
+    def delete_by_id(cls, product_id: int):
+        """Deletes a Product by id without loading it first
+
+        Issues a single DELETE statement; deleting an id that does not
+        exist is a no-op at the SQL level
+
+        :param product_id: the id of the Product to delete
+        :type product_id: int
+
+        """
+        logger.info("Deleting product id %s ...", product_id)
+        db.session.execute(delete(cls).where(cls.id == product_id))
+
+    @classmethod
+    def bulk_create(cls, products: list):
+        """Creates a batch of Products in a single commit
+
+        :param products: the Products to save
+        :type products: list
+
+        """
+        logger.info("Creating %d products", len(products))
+        for product in products:
+            # id must be none to generate next primary key
+            product.id = None
+        db.session.add_all(products)
+        db.session.commit()
+
     @classmethod
     def all(cls) -> list:
         """Returns all of the Products in the database"""
         logger.info("Processing all Products")
         return cls.query.all()
 
+    @classmethod
+    def list_rows(cls, *clauses):
+        """Returns a query of lightweight column tuples for list queries
+
+        Querying the columns directly skips ORM instance construction
+        (identity map, attribute instrumentation) for every row which
+        is the hot path when listing Products. The query is returned
+        unexecuted so callers can compose ordering and a page limit
+        before running it
+
+        :param clauses: optional filter clauses to apply
+        :type clauses: ColumnElement
+
+        :return: a query of (id, name, description, price, available, category) tuples
+        :rtype: Query
+
+        """
+        logger.info("Processing row query %s ...", clauses)
+        columns = [getattr(cls, name) for name in cls.LIST_COLUMNS]
+        query = db.session.query(*columns)
+        if clauses:
+            query = query.filter(*clauses)
+        return query
+
     @classmethod
     def find(cls, product_id: int):
         """Finds a Product by it's ID
@@ -18,12 +18,77 @@
 """
 Product Store Service with UI
 """
-from flask import jsonify, request, abort
+from collections import OrderedDict
+
+import orjson
+from flask import g, jsonify, request, abort
 from flask import url_for  # noqa: F401 pylint: disable=unused-import
-from service.models import Product,Category
+from service.models import Product,Category, db
 from service.common import status  # HTTP Status Codes
 from . import app
 
+# Lookup of Category members by name so query parsing avoids getattr()
+_CATEGORY_BY_NAME = {c.name: c for c in Category}
+
+# Values accepted as "true" for boolean query parameters
+_TRUTHY = frozenset({"true", "yes", "1", "t", "y"})
+
+# In-process LRU cache of serialized product payloads keyed by product id
+# Entries are evicted on update/delete and when the cache grows too large
+_PRODUCT_CACHE: OrderedDict = OrderedDict()
+_PRODUCT_CACHE_SIZE = 1024
+
+# Cached external URL prefix for Location headers, computed on first use
+_product_url_prefix = None  # pylint: disable=invalid-name
+
+
+def _location_url(product_id: int) -> str:
+    """Builds the Location URL for a product without walking the URL map
+
+    The external prefix is computed once with url_for() and reused.
+    Under TESTING the prefix is not cached because SERVER_NAME may vary
+    """
+    if app.config.get("TESTING"):
+        return url_for("get_products", product_id=product_id, _external=True)
+    global _product_url_prefix  # pylint: disable=global-statement
+    if _product_url_prefix is None:
+        _product_url_prefix = url_for(
+            "get_products", product_id=0, _external=True
+        ).rsplit("/", 1)[0]
+    return f"{_product_url_prefix}/{product_id}"
+
+
+def _evict_after_commit(product_id: int):
+    """Schedules a cache eviction for after the request's commit
+
+    Popping inside the handler opens a window where a concurrent GET
+    re-caches the pre-commit row; commit_session drops the scheduled
+    ids only once the commit has landed
+    """
+    g.setdefault("evict_ids", []).append(product_id)
+
+
+######################################################################
+# R E Q U E S T   L I F E C Y C L E
+######################################################################
+@app.after_request
+def commit_session(response):
+    """Commits the session once per request
+
+    The model write methods only flush, so a request makes at most one
+    commit (one fsync) no matter how many writes it performed. Failed
+    responses roll the pending work back instead
+    """
+    if response.status_code < status.HTTP_400_BAD_REQUEST:
+        db.session.commit()
+        # evictions scheduled by the write handlers happen only now,
+        # so a racing GET can no longer re-cache the pre-commit row
+        for product_id in g.pop("evict_ids", ()):
+            _PRODUCT_CACHE.pop(product_id, None)
+    else:
+        db.session.rollback()
+    return response
+
 
 ######################################################################
 # H E A L T H   C H E C K
@@ -46,24 +111,44 @@ def index():
 ######################################################################
 #  U T I L I T Y   F U N C T I O N S
 ######################################################################
+def _serialize_row(row) -> dict:
+    """Builds a JSON-ready dict from a (id, name, ...) column tuple"""
+    return {
+        "id": row.id,
+        "name": row.name,
+        "description": row.description,
+        "price": str(row.price),
+        "available": row.available,
+        "category": row.category.name,
+    }
+
+
+def _stream_rows(rows):
+    """Generator that streams column tuples as a JSON array
+
+    Serializing row by row keeps the full payload from ever being
+    materialized; the row set itself is bounded by the page limit
+    """
+    yield b"["
+    first = True
+    for row in rows:
+        if not first:
+            yield b","
+        yield orjson.dumps(_serialize_row(row))
+        first = False
+    yield b"]"
+
+
 def check_content_type(content_type):
     """Checks that the media type is correct"""
-    if "Content-Type" not in request.headers:
-        app.logger.error("No Content-Type specified.")
+    # Werkzeug has already parsed and cached the mimetype as an attribute
+    if request.mimetype != content_type:
+        app.logger.error("Invalid Content-Type: %s", request.mimetype)
         abort(
             status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             f"Content-Type must be {content_type}",
         )
 
-    if request.headers["Content-Type"] == content_type:
-        return
-
-    app.logger.error("Invalid Content-Type: %s", request.headers["Content-Type"])
-    abort(
-        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-        f"Content-Type must be {content_type}",
-    )
-
 
 ######################################################################
 # C R E A T E   A   N E W   P R O D U C T
@@ -78,19 +163,17 @@ def create_products():
     check_content_type("application/json")
 
     data = request.get_json()
-    app.logger.info("Processing: %s", data)
     product = Product()
     product.deserialize(data)
     product.create()
     app.logger.info("Product with new id [%s] saved!", product.id)
 
+    # ids can be reused after deletes so drop any stale cache entry
+    _evict_after_commit(product.id)
+
     message = product.serialize()
 
-    #
-    # Uncomment this line of code once you implement READ A PRODUCT
-    #
-    location_url = url_for("get_products", product_id=product.id, _external=True)
-    #location_url = "/"  # delete once READ is implemented
+    location_url = _location_url(product.id)
     return jsonify(message), status.HTTP_201_CREATED, {"Location": location_url}
 
 
@@ -102,52 +185,53 @@ def create_products():
 @app.route("/products", methods=["GET"])
 def list_products():
     """Returns a list of Products"""
-    app.logger.info("Request to list Products...")  
-    
-    # Initialize an empty list to hold the products.
-    products = []
+    app.logger.info("Request to list Products...")
 
-    # Get the `name` parameter from the request 
+    # Initialize an empty list to hold the filter clauses.
+    clauses = []
+
+    # Get the `name` parameter from the request
     name = request.args.get("name")
-    # Get the `category` parameter from the request 
+    # Get the `category` parameter from the request
     category = request.args.get("category")
     # Get the `available` parameter from the request
     available = request.args.get("available")
 
-    # test to see if you received the "name" query parameter
-    # If you did, call the Product.find_by_name(name) method to retrieve products that match the specified name
+    # all supplied filters are AND-combined into a single WHERE clause
     if name:
         app.logger.info("Find by name: %s", name)
-        products = Product.find_by_name(name)
-    # test to see if you received the "category" query parameter
-    # If you did, convert the category string retrieved from the query parameters to the corresponding enum value from the Category enumeration
-    # call the Product.find_by_category(category_value) method to retrieve products that match the specified category_value
-    elif category:
+        clauses.append(Product.name == name)
+    if category:
         app.logger.info("Find by category: %s", category)
         # create enum from string
-        category_value = getattr(Category, category.upper())
-        products = Product.find_by_category(category_value)
-    # test to see if you received the "available" query parameter
-    # If you did, convert the available string retrieved from the query parameters to a boolean value
-    # call the Product.find_by_availability(available_value) method to retrieve products that match the specified available_value
-    elif available:
+        category_value = _CATEGORY_BY_NAME.get(category.upper())
+        if category_value is None:
+            abort(status.HTTP_400_BAD_REQUEST, f"Invalid category: {category}")
+        clauses.append(Product.category == category_value)
+    if available:
         app.logger.info("Find by available: %s", available)
         # create bool from string
-        available_value = available.lower() in ["true", "yes", "1"]
-        products = Product.find_by_availability(available_value)
-    # If you didn't call list all
-    else:
-        app.logger.info("Find all")
-        products = Product.all()
+        available_value = available.lower() in _TRUTHY
+        clauses.append(Product.available == available_value)
+
+    # keyset pagination bounds both the query and the encode time;
+    # clamp to 1..500 so limit=-1 cannot bypass the cap
+    limit = max(1, min(request.args.get("limit", 100, type=int) or 100, 500))
+    after_id = request.args.get("after_id", type=int)
+    if after_id is not None:
+        clauses.append(Product.id > after_id)
 
-    # create a list of serialize() products
-    results = [product.serialize() for product in products]
+    rows = Product.list_rows(*clauses).order_by(Product.id).limit(limit).all()
 
-    # log the number of products being returned in the list
-    app.logger.info("[%s] Products returned", len(results))
+    # stream the serialization so the payload is never fully materialized
+    response = app.response_class(_stream_rows(rows), mimetype="application/json")
 
-    # return the list with a return code of status.HTTP_200_OK
-    return results, status.HTTP_200_OK
+    # advertise the next page whenever this one came back full
+    if len(rows) == limit:
+        next_args = {k: v for k, v in request.args.items() if k != "after_id"}
+        next_url = url_for("list_products", after_id=rows[-1].id, **next_args)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response, status.HTTP_200_OK
 
 ######################################################################
 # READ A PRODUCT
@@ -161,15 +245,27 @@ def get_products(product_id):
     """
     app.logger.info("Request to Retrieve a product with id [%s]", product_id)
 
+    # serve the payload straight from the cache when we have it
+    payload = _PRODUCT_CACHE.get(product_id)
+    if payload is not None:
+        _PRODUCT_CACHE.move_to_end(product_id)
+        return app.response_class(payload, mimetype="application/json"), status.HTTP_200_OK
+
     # use the Product.find() method to find the product
     product = Product.find(product_id)
     # abort() with a status.HTTP_404_NOT_FOUND if it cannot be found
     if not product:
         abort(status.HTTP_404_NOT_FOUND, f"Product with id '{product_id}' was not found.")
-    
+
+    # cache the serialized bytes for the next read, evicting the oldest entry
+    payload = orjson.dumps(product.serialize())
+    _PRODUCT_CACHE[product_id] = payload
+    if len(_PRODUCT_CACHE) > _PRODUCT_CACHE_SIZE:
+        _PRODUCT_CACHE.popitem(last=False)
+
     # return the serialize() version of the product with a return code of status.HTTP_200_OK
     app.logger.info("Returning product: %s", product.name)
-    return product.serialize(), status.HTTP_200_OK
+    return app.response_class(payload, mimetype="application/json"), status.HTTP_200_OK
 
 ######################################################################
 # UPDATE AN EXISTING PRODUCT
@@ -183,22 +279,31 @@ def update_products(product_id):
     app.logger.info("Request to Update a product with id [%s]", product_id)
     check_content_type("application/json")
 
-    # use the Product.find() method to retrieve the product by the product_id
-    product = Product.find(product_id)
+    # validate the payload with deserialize() on a transient instance
+    product = Product()
+    product.deserialize(request.get_json())
+
+    # issue a single UPDATE ... RETURNING instead of find() then update()
+    row = Product.update_by_id(
+        product_id,
+        {
+            "name": product.name,
+            "description": product.description,
+            "price": product.price,
+            "available": product.available,
+            "category": product.category,
+        },
+    )
 
     # abort() with a status.HTTP_404_NOT_FOUND if it cannot be found
-    if not product:
+    if row is None:
         abort(status.HTTP_404_NOT_FOUND, f"Product with id '{product_id}' was not found.")
-    
-    # call the deserialize() method on the product passing in request.get_json()
-    product.deserialize(request.get_json())
 
-    # call product.update() to update the product with the new data
-    product.id = product_id
-    product.update()
+    # invalidate any cached payload for this product once the commit lands
+    _evict_after_commit(product_id)
 
-    # return the serialize() version of the product with a return code of status.HTTP_200_OK    
-    return product.serialize(), status.HTTP_200_OK
+    # return the updated row with a return code of status.HTTP_200_OK
+    return _serialize_row(row), status.HTTP_200_OK
 
 ######################################################################
 # DELETE A PRODUCT
@@ -212,12 +317,12 @@ def delete_products(product_id):
     """
     app.logger.info("Request to Delete a product with id [%s]", product_id)
 
-    # use the Product.find() method to retrieve the product by the product_id
-    product = Product.find(product_id)
+    # issue a single DELETE statement; no SELECT is needed because
+    # deleting a nonexistent id is a no-op and we always return 204
+    Product.delete_by_id(product_id)
 
-    # if found, call the delete() method on the product
-    if product:
-        product.delete()
+    # invalidate any cached payload for this product once the commit lands
+    _evict_after_commit(product_id)
 
     # return and empty body ("") with a return code of status.HTTP_204_NO_CONTENT
     return "", status.HTTP_204_NO_CONTENT
\ No newline at end of file
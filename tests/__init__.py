@@ -0,0 +1,39 @@
+"""
+Shared helpers for the test suites
+"""
+import os
+
+from sqlalchemy import event
+
+# Default the suite to in-process SQLite before the service package is
+# imported (it connects at import time); exporting DATABASE_URI still
+# points the tests at Postgres
+os.environ.setdefault("DATABASE_URI", "sqlite:///:memory:")
+
+# Under pytest-xdist give each worker its own Postgres database so
+# parallel workers never share tables. In-memory SQLite is already
+# private to each worker process
+_XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER")
+if _XDIST_WORKER and os.environ["DATABASE_URI"].startswith("postgres"):
+    os.environ["DATABASE_URI"] = f"{os.environ['DATABASE_URI']}_{_XDIST_WORKER}"
+
+
+def enable_sqlite_savepoints(engine):
+    """Gives pysqlite working SAVEPOINT support
+
+    The sqlite3 driver's implicit transaction handling breaks nested
+    transactions; disable it and emit BEGIN ourselves as recommended in
+    the SQLAlchemy pysqlite docs. Safe to call more than once on the
+    same engine
+    """
+    if getattr(engine, "_savepoints_enabled", False):
+        return
+    engine._savepoints_enabled = True  # pylint: disable=protected-access
+
+    @event.listens_for(engine, "connect")
+    def _do_connect(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _do_begin(connection):
+        connection.exec_driver_sql("BEGIN")
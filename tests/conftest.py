@@ -0,0 +1,98 @@
+######################################################################
+# Copyright 2016, 2023 John J. Rofrano. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+######################################################################
+"""
+Pytest fixtures for the route test suite
+
+The app, database and test client are session scoped so Flask boots
+and the schema is created exactly once; each test that writes runs
+inside a connection-level transaction that is rolled back afterwards
+"""
+import os
+import logging
+
+import pytest
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from service import app as service_app
+from service.models import db, init_db, Product
+from service.routes import _PRODUCT_CACHE
+from tests import enable_sqlite_savepoints
+from tests.factories import ProductFactory
+
+
+@pytest.fixture(scope="session", name="app")
+def app_fixture():
+    """The Flask app configured for testing"""
+    service_app.config["TESTING"] = True
+    service_app.config["DEBUG"] = False
+    service_app.config["SQLALCHEMY_DATABASE_URI"] = os.environ["DATABASE_URI"]
+    service_app.logger.setLevel(logging.CRITICAL)
+    return service_app
+
+
+@pytest.fixture(scope="session", name="_db")
+def db_fixture(app):
+    """The initialized database with a clean product table"""
+    init_db(app)
+    if db.engine.dialect.name == "sqlite":
+        enable_sqlite_savepoints(db.engine)
+    # one table-level wipe for a clean baseline
+    db.session.query(Product).delete()
+    db.session.commit()
+    db.session.remove()
+    # warm up Faker's lazy locale/provider imports here instead of
+    # inside whichever test happens to build the first factory
+    ProductFactory.build_batch(2)
+    return db
+
+
+@pytest.fixture(scope="session")
+def client(app, _db):  # pylint: disable=unused-argument
+    """A reusable test client; it is pure WSGI and never opens a socket"""
+    assert app.testing, "test client requested outside TESTING mode"
+    return app.test_client()
+
+
+@pytest.fixture(name="db_session")
+def db_session_fixture(_db):
+    """Runs a test inside an external transaction
+
+    The per-request commit becomes a savepoint, so rolling the outer
+    transaction back undoes everything the test wrote without a
+    per-test DELETE
+    """
+    # the payload cache outlives the rollback while SQLite reuses the
+    # rolled-back ids, so stale entries would serve another test's rows
+    _PRODUCT_CACHE.clear()
+    connection = _db.engine.connect()
+    transaction = connection.begin()
+    original_session = _db.session
+    # the model methods flush explicitly, so autoflush only adds
+    # redundant flushes; expire_on_commit would force a reload of every
+    # attribute the assertions read after a request commits
+    _db.session = scoped_session(
+        sessionmaker(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    )
+    yield _db.session
+    _db.session.remove()
+    _db.session = original_session
+    transaction.rollback()
+    connection.close()
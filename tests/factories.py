@@ -21,6 +21,20 @@ import factory
 from factory.fuzzy import FuzzyChoice, FuzzyDecimal
 from service.models import Product, Category
 
+PRODUCT_NAMES = [
+    "Hat",
+    "Pants",
+    "Shirt",
+    "Apple",
+    "Banana",
+    "Pots",
+    "Towels",
+    "Ford",
+    "Chevy",
+    "Hammer",
+    "Wrench",
+]
+
 
 class ProductFactory(factory.Factory):
     """Creates fake products for testing"""
@@ -31,21 +45,7 @@ class ProductFactory(factory.Factory):
         model = Product
 
     id = factory.Sequence(lambda n: n)
-    name = FuzzyChoice(
-        choices=[
-            "Hat",
-            "Pants",
-            "Shirt",
-            "Apple",
-            "Banana",
-            "Pots",
-            "Towels",
-            "Ford",
-            "Chevy",
-            "Hammer",
-            "Wrench"
-        ]
-    )
+    name = FuzzyChoice(choices=PRODUCT_NAMES)
     description = factory.Faker("text")
     price = FuzzyDecimal(0.5, 2000.0, 2)
     available = FuzzyChoice(choices=[True, False])